@@ -1,76 +1,152 @@
 """
 config/settings.py
 ------------------
-Central configuration using pydantic.BaseSettings.  Environment variables are
-loaded from a `.env` file in the project root; validation, defaulting and
-conversion are handled automatically.  This file exports a single `settings`
-instance that the rest of the codebase can import.
+Central configuration read straight from environment variables.  The `.env`
+file in the project root is parsed once with a tiny loader; type conversion
+is handled by small helpers.  This file exports a single `settings` instance
+that the rest of the codebase can import.
 """
 
 from __future__ import annotations
 
+import os
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
-# pydantic 2+ moved BaseSettings into separate package
-# install 'pydantic-settings' which reexports the original class
-from pydantic_settings import BaseSettings
-
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
-class Settings(BaseSettings):
-    # ── directories ─────────────────────────────────────────────────────────
-    INPUT_DIR: Path = BASE_DIR / "input"
-    OUTPUT_DIR: Path = BASE_DIR / "output"
-    SENT_DIR: Path = BASE_DIR / "sent"
-    SENT_SUCCESS: Path = SENT_DIR / "success"
-    SENT_FAILURE: Path = SENT_DIR / "failure"
-    TEMPLATE_DIR: Path = BASE_DIR / "templates"
+# ── env helpers ─────────────────────────────────────────────────────────────
 
-    # ── oracle configuration ─────────────────────────────────────────────────
-    ORACLE_USER: str
-    ORACLE_PWD: str
-    ORACLE_DSN: str
-    ORACLE_WALLET_LOCATION: Optional[str] = None
-    ORACLE_WALLET_PASSWORD: Optional[str] = None
+def _load_env_file(path: Path) -> None:
+    """Carrega pares CHAVE=VALOR de um .env sem sobrescrever o ambiente."""
+    if not path.exists():
+        return
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, _, value = line.partition("=")
+        os.environ.setdefault(key.strip(), value.strip().strip("'\""))
 
-    # ── email / AWS SES -----------------------------------------------------
-    EMAIL_HOST: Optional[str] = None
-    EMAIL_PORT: int = 587
-    EMAIL_USE_TLS: bool = True
-    EMAIL_USER: Optional[str] = None
-    EMAIL_PASSWORD: Optional[str] = None
-    EMAIL_FROM: Optional[str] = None
 
-    AWS_ACCESS_KEY_ID: Optional[str] = None
-    AWS_SECRET_ACCESS_KEY: Optional[str] = None
-    AWS_REGION: str = "sa-east-1"
+def _env(name: str, default: str | None = None) -> str | None:
+    value = os.environ.get(name)
+    return value if value else default
 
-    MODO_TESTE: bool = False
-    EMAIL_TESTE: Optional[str] = None
 
-    # ── business values ----------------------------------------------------
-    NOME_EMPRESA: str = "CLARO PAY INSTITUICAO DE PAGAMENTO SA"
-    ANO_CALENDARIO: str = "2025"
+def _env_bool(name: str, default: bool = False) -> bool:
+    value = _env(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
 
-    class Config:
-        env_file = BASE_DIR / ".env"
-        env_file_encoding = "utf-8"
-        extra = "ignore"  # allow unrelated env vars
 
+def _env_int(name: str, default: int) -> int:
+    value = _env(name)
+    return int(value) if value is not None else default
 
-# single, shared settings object
-settings = Settings()
 
-# convenience constants for backwards compatibility
-INPUT_DIR = settings.INPUT_DIR
-OUTPUT_DIR = settings.OUTPUT_DIR
-SENT_DIR = settings.SENT_DIR
-SENT_SUCCESS = settings.SENT_SUCCESS
-SENT_FAILURE = settings.SENT_FAILURE
-TEMPLATE_DIR = settings.TEMPLATE_DIR
-NOME_EMPRESA = settings.NOME_EMPRESA
-ANO_CALENDARIO = settings.ANO_CALENDARIO
+@dataclass(frozen=True, slots=True)
+class Settings:
+    # ── directories ─────────────────────────────────────────────────────────
+    INPUT_DIR: Path
+    OUTPUT_DIR: Path
+    SENT_DIR: Path
+    SENT_SUCCESS: Path
+    SENT_FAILURE: Path
+    TEMPLATE_DIR: Path
 
+    # ── oracle configuration ─────────────────────────────────────────────────
+    ORACLE_USER: str
+    ORACLE_PWD: str
+    ORACLE_DSN: str
+    ORACLE_WALLET_LOCATION: Optional[str]
+    ORACLE_WALLET_PASSWORD: Optional[str]
+
+    # ── email / AWS SES -----------------------------------------------------
+    EMAIL_HOST: Optional[str]
+    EMAIL_PORT: int
+    EMAIL_USE_TLS: bool
+    EMAIL_USER: Optional[str]
+    EMAIL_PASSWORD: Optional[str]
+    EMAIL_FROM: Optional[str]
+
+    AWS_ACCESS_KEY_ID: Optional[str]
+    AWS_SECRET_ACCESS_KEY: Optional[str]
+    AWS_REGION: str
+
+    MODO_TESTE: bool
+    EMAIL_TESTE: Optional[str]
+    EMAIL_WORKERS: int     # threads simultâneas de envio
+    SES_RATE_LIMIT: int    # envios por segundo (0 = sem limite)
+    TEST_SAMPLE_SIZE: int  # máximo de PDFs enviados em MODO_TESTE
+
+    # ── business values ----------------------------------------------------
+    NOME_EMPRESA: str
+    ANO_CALENDARIO: str
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        _load_env_file(BASE_DIR / ".env")
+
+        faltando = [k for k in ("ORACLE_USER", "ORACLE_PWD", "ORACLE_DSN") if not _env(k)]
+        if faltando:
+            raise RuntimeError(
+                "Variáveis de ambiente obrigatórias ausentes: " + ", ".join(faltando)
+            )
+
+        sent_dir = Path(_env("SENT_DIR") or BASE_DIR / "sent")
+        return cls(
+            INPUT_DIR=Path(_env("INPUT_DIR") or BASE_DIR / "input"),
+            OUTPUT_DIR=Path(_env("OUTPUT_DIR") or BASE_DIR / "output"),
+            SENT_DIR=sent_dir,
+            SENT_SUCCESS=Path(_env("SENT_SUCCESS") or sent_dir / "success"),
+            SENT_FAILURE=Path(_env("SENT_FAILURE") or sent_dir / "failure"),
+            TEMPLATE_DIR=Path(_env("TEMPLATE_DIR") or BASE_DIR / "templates"),
+            ORACLE_USER=_env("ORACLE_USER"),
+            ORACLE_PWD=_env("ORACLE_PWD"),
+            ORACLE_DSN=_env("ORACLE_DSN"),
+            ORACLE_WALLET_LOCATION=_env("ORACLE_WALLET_LOCATION"),
+            ORACLE_WALLET_PASSWORD=_env("ORACLE_WALLET_PASSWORD"),
+            EMAIL_HOST=_env("EMAIL_HOST"),
+            EMAIL_PORT=_env_int("EMAIL_PORT", 587),
+            EMAIL_USE_TLS=_env_bool("EMAIL_USE_TLS", True),
+            EMAIL_USER=_env("EMAIL_USER"),
+            EMAIL_PASSWORD=_env("EMAIL_PASSWORD"),
+            EMAIL_FROM=_env("EMAIL_FROM"),
+            AWS_ACCESS_KEY_ID=_env("AWS_ACCESS_KEY_ID"),
+            AWS_SECRET_ACCESS_KEY=_env("AWS_SECRET_ACCESS_KEY"),
+            AWS_REGION=_env("AWS_REGION", "sa-east-1"),
+            MODO_TESTE=_env_bool("MODO_TESTE", False),
+            EMAIL_TESTE=_env("EMAIL_TESTE"),
+            EMAIL_WORKERS=_env_int("EMAIL_WORKERS", 16),
+            SES_RATE_LIMIT=_env_int("SES_RATE_LIMIT", 0),
+            TEST_SAMPLE_SIZE=_env_int("TEST_SAMPLE_SIZE", 5),
+            NOME_EMPRESA=_env("NOME_EMPRESA", "CLARO PAY INSTITUICAO DE PAGAMENTO SA"),
+            ANO_CALENDARIO=_env("ANO_CALENDARIO", "2025"),
+        )
+
+
+# single, shared settings object — created lazily on first attribute access
+# (PEP 562) so code paths that never read configuration (e.g. `--help`)
+# skip the .env parse at import time
+_settings: Settings | None = None
+
+def _load() -> Settings:
+    global _settings
+    if _settings is None:
+        _settings = Settings.from_env()
+    return _settings
+
+
+def __getattr__(name: str):
+    if name == "settings":
+        return _load()
+    # qualquer campo de Settings pode ser lido como constante do módulo
+    # (compatibilidade com `from config.settings import INPUT_DIR` etc.)
+    if name in Settings.__dataclass_fields__:
+        return getattr(_load(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
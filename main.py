@@ -11,47 +11,68 @@ Uso:
 
 import argparse
 import logging
-import re
+import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from time import perf_counter
-from datetime import datetime
+from datetime import date, datetime
 
+# sempre via o módulo: o objeto Settings só é construído (e o .env só é
+# lido) quando um atributo é de fato acessado, então caminhos rápidos como
+# `--help` não exigem credenciais configuradas
 from config import settings
-from config.settings import (
-    INPUT_DIR,
-    OUTPUT_DIR,
-    SENT_DIR,
-    SENT_SUCCESS,
-    SENT_FAILURE,
-    TEMPLATE_DIR,
-    NOME_EMPRESA,
-    ANO_CALENDARIO,
-)
 from src.pdf_processor import PDFProcessor
 from src.database import OracleDB
 from src.email_sender import EmailSender
 
 
+# tabela que remove tudo que não é dígito — str.translate roda em C puro,
+# bem mais rápido que re.sub para os nomes de arquivo curtos do loop de envio
+_DIGITS_ONLY = str.maketrans(
+    "", "", "".join(chr(c) for c in range(256) if not chr(c).isdigit())
+)
+
+# divisores de log pré-computados — evita realocar as strings a cada linha
+_DIV = "═" * 60
+_SUB = "─" * 60
+
+
+def _list_pdfs(directory: Path) -> list[Path]:
+    """
+    Lista os PDFs de um diretório em ordem determinística.
+    Usa os.scandir e ordena os nomes como strings: evita construir um Path
+    por entrada durante o filtro, o que pesa em lotes grandes.
+    """
+    if not directory.is_dir():
+        return []
+    with os.scandir(directory) as it:
+        names = [e.name for e in it if e.is_file() and e.name.endswith(".pdf")]
+    names.sort()
+    return [directory / name for name in names]
+
+
 # ── Module 1: Split PDFs ─────────────────────────────────────────────────────
 
 def split_pdfs() -> list[Path]:
     """Split all PDFs from input/ by CPF/CNPJ into output/."""
     logger = logging.getLogger("main.split")
-    pdfs = sorted(INPUT_DIR.glob("*.pdf"))
+    pdfs = _list_pdfs(settings.INPUT_DIR)
 
     if not pdfs:
-        logger.warning("Nenhum PDF encontrado em: %s", INPUT_DIR.resolve())
+        logger.warning("Nenhum PDF encontrado em: %s", settings.INPUT_DIR.resolve())
         logger.info("Coloque o arquivo na pasta 'input/' e execute novamente.")
         sys.exit(0)
 
-    processor = PDFProcessor(output_dir=OUTPUT_DIR)
+    processor = PDFProcessor(output_dir=settings.OUTPUT_DIR)
     generated_files: list[Path] = []
     batch_started_at = datetime.now()
     batch_started_perf = perf_counter()
 
     for pdf in pdfs:
-        logging.info("\n%s", '─' * 60)
+        logging.info("\n%s", _SUB)
         result = processor.process(pdf)
         generated_files.extend(result.generated_files)
         logging.info("  Resumo: %d páginas → %d arquivos", result.total_pages, result.total_files)
@@ -65,8 +86,8 @@ def split_pdfs() -> list[Path]:
     batch_finished_at = datetime.now()
     batch_elapsed = perf_counter() - batch_started_perf
 
-    logging.info("\n%s", '═' * 60)
-    logging.info("  Total  : %d arquivo(s) em %s", len(generated_files), OUTPUT_DIR.resolve())
+    logging.info("\n%s", _DIV)
+    logging.info("  Total  : %d arquivo(s) em %s", len(generated_files), settings.OUTPUT_DIR.resolve())
     logging.info(
         "  Processamento total: início=%s | fim=%s | total=%.2fs",
         batch_started_at.strftime("%Y-%m-%d %H:%M:%S"),
@@ -78,65 +99,115 @@ def split_pdfs() -> list[Path]:
 
 # ── Module 2: Send Emails ───────────────────────────────────────────────────
 
+def _send_one(
+    pdf: Path,
+    id_number: str,
+    accounts: dict[str, tuple],
+    sender: EmailSender,
+    ano: str,
+    company: str,
+    success_dir: str,
+    failure_dir: str,
+) -> str:
+    """Envia um único PDF; retorna 'sent', 'not_found' ou 'error'."""
+    account = accounts.get(id_number)
+
+    if not account:
+        logging.warning("[N/F] %s — não encontrado no Oracle", id_number)
+        return "not_found"
+
+    name  = account.nome or "Client"
+    email = account.email or ""
+
+    if not email:
+        logging.warning("[S/E] %s — nenhum e-mail cadastrado", id_number)
+        return "not_found"
+
+    try:
+        sender.send(
+            recipient=email,
+            subject=f"Informe de Rendimentos {ano} — {company}",
+            attachment=pdf,
+            customer_name=name,
+        )
+        os.replace(pdf, success_dir + pdf.name)
+        return "sent"
+    except Exception as e:
+        logging.error("[ERRO] %s: %s", pdf.name, e)
+        os.replace(pdf, failure_dir + pdf.name)
+        return "error"
+
+
 def enviar_emails(files: list[Path] | None = None) -> None:
     """Sends an email for each PDF in the output/ folder using Oracle data."""
     if files is None:
-        files = sorted(OUTPUT_DIR.glob("*.pdf"))
+        files = _list_pdfs(settings.OUTPUT_DIR)
 
     if not files:
-        logging.warning("Nenhum PDF encontrado em: %s", OUTPUT_DIR.resolve())
+        logging.warning("Nenhum PDF encontrado em: %s", settings.OUTPUT_DIR.resolve())
         return
 
-    SENT_DIR.mkdir(exist_ok=True)
-    SENT_SUCCESS.mkdir(exist_ok=True)
-    SENT_FAILURE.mkdir(exist_ok=True)
+    # em modo de teste tudo vai para EMAIL_TESTE; enviar o lote inteiro só
+    # martela o SES — uma amostra pequena já valida o fluxo
+    if settings.MODO_TESTE and len(files) > settings.TEST_SAMPLE_SIZE:
+        logging.info(
+            "[MODO TESTE] lote reduzido de %d para %d arquivo(s)",
+            len(files), settings.TEST_SAMPLE_SIZE,
+        )
+        files = files[:settings.TEST_SAMPLE_SIZE]
+
+    settings.SENT_DIR.mkdir(exist_ok=True)
+    settings.SENT_SUCCESS.mkdir(exist_ok=True)
+    settings.SENT_FAILURE.mkdir(exist_ok=True)
+
+    # destinos de envio como strings prontas: os.replace é um wrapper fino
+    # de syscall e dispensa a aritmética de Path por arquivo dentro do loop
+    success_dir = str(settings.SENT_SUCCESS) + os.sep
+    failure_dir = str(settings.SENT_FAILURE) + os.sep
 
     logger = logging.getLogger("main.enviar")
-    db     = OracleDB(log=logger)
-    sender = EmailSender(template_path=TEMPLATE_DIR / "informe.html")
-    ano    = ANO_CALENDARIO or "2025"
-    company = NOME_EMPRESA or "ClaroPay"
+    ano    = settings.ANO_CALENDARIO or "2025"
+    company = settings.NOME_EMPRESA or "ClaroPay"
+    # company_name e ano_atual valem para o lote inteiro: pré-substituídos
+    # no modelo uma única vez; cada envio só resolve customer_name
+    sender = EmailSender(
+        template_path=settings.TEMPLATE_DIR / "informe.html",
+        company_name=company,
+        ano_atual=str(date.today().year),
+    )
 
     sent_count = errors = not_found = 0  # renamed for clarity
 
-    logger.info("\n%s", "═" * 60)
+    logger.info("\n%s", _DIV)
     logger.info("  Enviando e-mails para %d arquivo(s)...", len(files))
-    logger.info("%s", "═" * 60)
-
-    for pdf in files:
-        id_number = re.sub(r"\D", "", pdf.stem)  # strip non-digits
-        account = db.get_account(id_number)
-
-        if not account:
-            logging.warning("[N/F] %s — não encontrado no Oracle", id_number)
-            not_found += 1
-            continue
-
-        name  = account.get("nome", "Client")
-        email = account.get("email", "")
-
-        if not email:
-            logging.warning("[S/E] %s — nenhum e-mail cadastrado", id_number)
-            not_found += 1
-            continue
-
-        try:
-            sender.send(
-                recipient=email,
-                subject=f"Informe de Rendimentos {ano} — {company}",
-                attachment=pdf,
-                customer_name=name,
-                company_name=company,
-                ano_atual=str(__import__("datetime").date.today().year),
+    logger.info("%s", _DIV)
+
+    # one batched IN-list query instead of one round-trip per PDF;
+    # o `with` garante que o pool seja encerrado ao fim do lote
+    ids = [p.stem.translate(_DIGITS_ONLY) for p in files]
+    with OracleDB(log=logger) as db:
+        accounts = db.get_accounts_bulk(ids)
+
+    # os envios são dominados por latência de rede (TLS até o SES), então
+    # distribuímos os PDFs entre threads e agregamos os status dos futures
+    with ThreadPoolExecutor(max_workers=settings.EMAIL_WORKERS) as executor:
+        futures = [
+            executor.submit(
+                _send_one, pdf, id_number, accounts, sender, ano, company,
+                success_dir, failure_dir,
             )
-            pdf.rename(SENT_SUCCESS / pdf.name)
-            sent_count += 1
-        except Exception as e:
-            logging.error("[ERRO] %s: %s", pdf.name, e)
-            pdf.rename(SENT_FAILURE / pdf.name)
-            errors += 1
-
-    logger.info("\n%s", "═" * 60)
+            for pdf, id_number in zip(files, ids)
+        ]
+        for future in as_completed(futures):
+            status = future.result()
+            if status == "sent":
+                sent_count += 1
+            elif status == "not_found":
+                not_found += 1
+            else:
+                errors += 1
+
+    logger.info("\n%s", _DIV)
     logger.info("  Enviados     : %d", sent_count)
     logger.info("  Não encontrados / sem e-mail : %d", not_found)
     logger.info("  Erros        : %d", errors)
@@ -145,15 +216,27 @@ def enviar_emails(files: list[Path] | None = None) -> None:
 # ── Entry point ───────────────────────────────────────────────────────────────
 
 def main() -> None:
-    # configure root logger: console + file
+    # configure root logger: console + rotating file, atrás de uma fila —
+    # as chamadas de log só enfileiram e retornam; uma thread do
+    # QueueListener faz o I/O de disco fora do loop de envio
+    log_queue: queue.Queue = queue.Queue(-1)
+    listener = QueueListener(
+        log_queue,
+        logging.StreamHandler(),
+        RotatingFileHandler(
+            "informe.log",
+            maxBytes=5_000_000,
+            backupCount=3,
+            encoding="utf-8",
+            delay=True,
+        ),
+    )
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s %(levelname)s %(name)s: %(message)s",
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler("informe.log", encoding="utf-8"),
-        ],
+        handlers=[QueueHandler(log_queue)],
     )
+    listener.start()
     parser = argparse.ArgumentParser(
         prog="main.py",
         description="Processador de PDF e envio de e-mails para informes de rendimento",
@@ -179,11 +262,14 @@ def main() -> None:
 
     files: list[Path] | None = None
 
-    if args.split:
-        files = split_pdfs()
+    try:
+        if args.split:
+            files = split_pdfs()
 
-    if args.send:
-        enviar_emails(files)
+        if args.send:
+            enviar_emails(files)
+    finally:
+        listener.stop()  # drena a fila antes de encerrar
 
 
 if __name__ == "__main__":
@@ -5,65 +5,80 @@ Camada de acesso ao banco Oracle.
 Dependência: oracledb (pip install oracledb)
 """
 import logging
+from collections import namedtuple
+from functools import lru_cache
 
 import oracledb
 
-from config.settings import settings
+# importa o módulo (e não o objeto) para que o carregamento das variáveis
+# de ambiente só aconteça no primeiro acesso a um atributo, não no import
+from config import settings
+
+
+@lru_cache(maxsize=32)
+def _row_factory(colunas: tuple[str, ...]):
+    """Namedtuple por conjunto de colunas, cacheado entre consultas iguais."""
+    return namedtuple("Row", colunas)
 
 
 class OracleDB:
+    _ACCOUNT_SQL  = "SELECT NOME, EMAIL FROM MATERA_CORRENTISTAS WHERE INSCRICAO = :1"
+    _ACCOUNT_ROW  = namedtuple("Row", ("nome", "email"))
+
     def __init__(self, log=None):
         cfg = settings
         self.__dsn      = cfg.ORACLE_DSN
         self.__username = cfg.ORACLE_USER
         self.__password = cfg.ORACLE_PWD
         self.__log      = log
-        self.__connection = None
-        self.__cursor     = None
+        self.__pool     = None
         self.__connect()
 
     # ── conexão ────────────────────────────────────────────────────────────────
 
     def __connect(self):
         try:
-            self.__connection = oracledb.connect(
+            # pool de sessões: conexões são compartilhadas entre as threads de
+            # envio e o statement cache evita re-parse das consultas repetidas
+            self.__pool = oracledb.create_pool(
                 user=self.__username,
                 password=self.__password,
                 dsn=self.__dsn,
+                min=2,
+                max=16,
+                increment=2,
+                stmtcachesize=50,
             )
-            self.__cursor = self.__connection.cursor()
             if self.__log:
                 self.__log.info("Conexão com Oracle estabelecida.")
             else:
                 logging.info("Conexão com Oracle estabelecida.")
         except Exception as e:
             if self.__log:
-                self.__log.error(f"Erro de conexão: {e}")
+                self.__log.error("Erro de conexão: %s", e)
             else:
-                logging.error(f"Erro de conexão: {e}")
+                logging.error("Erro de conexão: %s", e)
             raise
 
     def ensure_connection(self):
-        """Check that connection is alive; reconnect if needed."""
+        """Check that the pool is alive; recreate it if needed."""
         try:
-            self.__connection.ping()
+            with self.__pool.acquire() as conn:
+                conn.ping()
         except Exception:
             logging.info("Reconectando...")
             self.__connect()
 
     def fechar(self):
-        """Encerra cursor e conexão."""
+        """Encerra o pool de conexões."""
         try:
-            if self.__cursor:
-                self.__cursor.close()
-            if self.__connection:
-                self.__connection.close()
+            if self.__pool:
+                self.__pool.close()
             logging.info("Conexão com Oracle encerrada.")
         except Exception:
             pass
         finally:
-            self.__cursor     = None
-            self.__connection = None
+            self.__pool = None
 
     # ── context manager ────────────────────────────────────────────────────────
 
@@ -81,29 +96,40 @@ class OracleDB:
         Retorna None em caso de erro.
         """
         try:
-            self.__cursor.execute(query, params or [])
-            return self.__cursor.fetchall()
+            with self.__pool.acquire() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(query, params or [])
+                    return cursor.fetchall()
         except Exception as e:
             if self.__log:
-                self.__log.error(f"Erro ao executar consulta: {e}")
+                self.__log.error("Erro ao executar consulta: %s", e)
             else:
-                logging.error(f"Erro ao executar consulta: {e}")
+                logging.error("Erro ao executar consulta: %s", e)
             return None
 
-    def executar(self, query: str, params=None) -> list[dict]:
+    def executar(self, query: str, params=None) -> list[tuple]:
         """
-        Executa uma query e retorna lista de dicts {coluna: valor}.
-        Facilita o acesso por nome de coluna.
+        Executa uma query e retorna lista de namedtuples (acesso por nome de
+        coluna em minúsculas, ex.: row.nome). Namedtuples custam uma fração
+        de um dict por linha — sem tabela hash nem chaves repetidas.
         """
         try:
-            self.__cursor.execute(query, params or [])
-            colunas = [col[0].lower() for col in self.__cursor.description]
-            return [dict(zip(colunas, row)) for row in self.__cursor.fetchall()]
+            with self.__pool.acquire() as conn:
+                with conn.cursor() as cursor:
+                    # lotes de até 1000 linhas por ida à rede (padrão: 100);
+                    # custa mais memória por fetch, mas o IN-list de 1000
+                    # inscrições volta em uma única viagem
+                    cursor.arraysize = 1000
+                    cursor.prefetchrows = 1001
+                    cursor.execute(query, params or [])
+                    colunas = tuple(col[0].lower() for col in cursor.description)
+                    Row = _row_factory(colunas)
+                    return [Row._make(row) for row in cursor.fetchall()]
         except Exception as e:
             if self.__log:
-                self.__log.error(f"Erro ao executar consulta: {e}")
+                self.__log.error("Erro ao executar consulta: %s", e)
             else:
-                logging.error(f"Erro ao executar consulta: {e}")
+                logging.error("Erro ao executar consulta: %s", e)
             return []
 
     def testar_conexao(self) -> bool:
@@ -115,12 +141,43 @@ class OracleDB:
         logging.warning("[DB] falha na conexão.")
         return False
 
-    def get_account(self, registration: str) -> dict | None:
+    def get_account(self, registration: str) -> tuple | None:
         """
         Recupera NOME e EMAIL de um correntista por CPF/CNPJ normalizado.
         `registration` deve conter apenas dígitos (sem '.', '/', '-').
-        Retorna o primeiro registro correspondente ou None.
+        Retorna um namedtuple (nome, email) ou None.
+
+        O statement cache do pool reaproveita o SQL já analisado entre
+        chamadas; as colunas fixas dispensam a leitura de cursor.description.
         """
-        sql = "SELECT NOME, EMAIL FROM MATERA_CORRENTISTAS WHERE INSCRICAO = :1"
-        rows = self.executar(sql, [registration])
-        return rows[0] if rows else None
+        try:
+            with self.__pool.acquire() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(self._ACCOUNT_SQL, [registration])
+                    row = cursor.fetchone()
+                    return self._ACCOUNT_ROW._make(row) if row else None
+        except Exception as e:
+            if self.__log:
+                self.__log.error("Erro ao executar consulta: %s", e)
+            else:
+                logging.error("Erro ao executar consulta: %s", e)
+            return None
+
+    def get_accounts_bulk(self, registrations: list[str]) -> dict[str, tuple]:
+        """
+        Recupera NOME e EMAIL de vários correntistas em uma única consulta
+        (uma ida ao banco por lote de até 1000 inscrições, limite do IN do
+        Oracle), em vez de uma consulta por CPF/CNPJ.
+        Retorna {inscricao: namedtuple}; inscrições não encontradas ficam fora.
+        """
+        contas: dict[str, tuple] = {}
+        for inicio in range(0, len(registrations), 1000):
+            lote = registrations[inicio:inicio + 1000]
+            placeholders = ",".join(f":{i + 1}" for i in range(len(lote)))
+            sql = (
+                "SELECT NOME, EMAIL, INSCRICAO FROM MATERA_CORRENTISTAS "
+                f"WHERE INSCRICAO IN ({placeholders})"
+            )
+            for row in self.executar(sql, lote):
+                contas[row.inscricao] = row
+        return contas
@@ -7,17 +7,122 @@ A configuração é obtida do objeto `settings` compartilhado.
 
 from __future__ import annotations
 
+import io
 import logging
+import mmap
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from email import policy
+from email.generator import BytesGenerator
 from email.mime.application import MIMEApplication
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from functools import lru_cache
 from pathlib import Path
 from string import Template
+from typing import Iterable
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
-from config.settings import settings
+# importa o módulo (e não o objeto) para que o carregamento das variáveis
+# de ambiente só aconteça no primeiro acesso a um atributo, não no import
+from config import settings
+
+
+@lru_cache(maxsize=128)
+def _encoded_part(path_str: str, mtime: float) -> MIMEApplication:
+    """
+    MIMEApplication pronto (payload já em base64) para um anexo.
+    Cacheado por (caminho, mtime): reenvios do mesmo PDF não pagam de novo
+    a leitura do arquivo nem a codificação base64.
+    """
+    path = Path(path_str)
+    if path.stat().st_size:
+        # mmap em vez de read(): o codificador base64 consome as páginas
+        # direto do cache do kernel, sem alocar uma cópia do PDF no heap
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                parte = MIMEApplication(mm)
+    else:
+        parte = MIMEApplication(b"")  # mmap não aceita arquivo vazio
+    parte.add_header("Content-Disposition", "attachment", filename=path.name)
+    return parte
+
+
+# buffer de serialização reaproveitado por thread: cada envio trunca e
+# reusa o mesmo BytesIO em vez de alocar um novo para a mensagem inteira
+_serialize_local = threading.local()
+
+# refold_source="all" é obrigatório: os cabeçalhos vêm crus do compat32 e,
+# sem redobra, o policy.SMTP tenta codificá-los como ASCII puro — um assunto
+# com acento/travessão estouraria UnicodeEncodeError em todo envio
+_SMTP_POLICY = policy.SMTP.clone(refold_source="all")
+
+
+def _flatten(msg: MIMEMultipart) -> bytes:
+    """Serializa a mensagem para bytes usando o buffer da thread corrente."""
+    buf = getattr(_serialize_local, "buf", None)
+    if buf is None:
+        buf = _serialize_local.buf = io.BytesIO()
+    else:
+        buf.seek(0)
+        buf.truncate(0)
+    BytesGenerator(buf, mangle_from_=False, policy=_SMTP_POLICY).flatten(msg)
+    return buf.getvalue()
+
+
+def _html_part(body_html: str) -> MIMEText:
+    """
+    Corpo HTML com Content-Transfer-Encoding escolhido de uma vez:
+    corpo 100% ASCII (o caso comum do modelo) segue como 7bit, sem nenhuma
+    passada de codificação; com acentos, utf-8/base64 — mais barato que o
+    quoted-printable byte a byte.
+    """
+    if body_html.isascii():
+        return MIMEText(body_html, "html")
+    return MIMEText(body_html, "html", "utf-8")
+
+
+@dataclass(frozen=True)
+class EmailJob:
+    """Um envio pendente para EmailSender.send_many."""
+    recipient: str
+    subject: str
+    attachment: Path | None = None
+    template_vars: dict = field(default_factory=dict)
+
+
+class _TokenBucket:
+    """
+    Limitador de taxa (tokens por segundo) seguro entre threads.
+    Mantém os envios paralelos dentro da cota por segundo do SES, evitando
+    rajadas que terminam em "Throttling – Maximum sending rate exceeded".
+    """
+
+    def __init__(self, rate_per_sec: float) -> None:
+        self._rate   = rate_per_sec
+        self._tokens = rate_per_sec
+        self._last   = time.monotonic()
+        self._lock   = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._rate, self._tokens + (now - self._last) * self._rate
+                )
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+
 
 class EmailSender:
     """
@@ -27,9 +132,12 @@ class EmailSender:
 
     Variáveis de modelo disponíveis:
         $customer_name, $company_name, $ano_atual
+
+    Variáveis constantes em todo o lote podem ser passadas como kwargs no
+    construtor para serem pré-substituídas uma única vez.
     """
 
-    def __init__(self, template_path: Path) -> None:
+    def __init__(self, template_path: Path, **constant_vars: str) -> None:
         cfg = settings
         self._access_key  = cfg.AWS_ACCESS_KEY_ID or ""
         self._secret_key  = cfg.AWS_SECRET_ACCESS_KEY or ""
@@ -37,7 +145,37 @@ class EmailSender:
         self._from        = cfg.EMAIL_FROM or "auto_bko@claropay.com.br"
         self._modo_teste  = cfg.MODO_TESTE
         self._email_teste = cfg.EMAIL_TESTE or ""
+        # SES_RATE_LIMIT = 0 desativa o limitador
+        self._rate_limiter = (
+            _TokenBucket(cfg.SES_RATE_LIMIT) if cfg.SES_RATE_LIMIT > 0 else None
+        )
         self._template    = self._load_template(template_path)
+        # variáveis constantes no lote (ex.: company_name) são substituídas
+        # uma única vez aqui; cada send só resolve as que variam por
+        # destinatário, em vez de percorrer o modelo inteiro de novo
+        if constant_vars:
+            self._template = Template(self._template.safe_substitute(**constant_vars))
+        # corpos renderizados repetem-se quando as variáveis coincidem
+        # (ex.: reenvio, homônimos): memoiza por tupla ordenada de variáveis
+        self._render_cached = lru_cache(maxsize=1024)(self._render_items)
+        # sessão e cliente criados uma única vez: cada boto3.client avulso
+        # monta uma botocore.session nova e recarrega os JSONs de endpoint e
+        # modelo de serviço do disco; a sessão própria amortiza esse custo e
+        # o pool de conexões é dimensionado para os envios em paralelo
+        self._boto_session = boto3.session.Session(
+            aws_access_key_id=self._access_key,
+            aws_secret_access_key=self._secret_key,
+            region_name=self._region,
+        )
+        self._client = self._boto_session.client(
+            "ses",
+            config=Config(
+                max_pool_connections=32,
+                retries={"max_attempts": 5, "mode": "adaptive"},
+                connect_timeout=3,
+                read_timeout=10,
+            ),
+        )
 
     # ── template ──────────────────────────────────────────────────────────────
 
@@ -47,18 +185,11 @@ class EmailSender:
             raise FileNotFoundError(f"Modelo não encontrado: {path}")
         return Template(path.read_text(encoding="utf-8"))
 
-    def _render(self, **variables: str) -> str:
-        return self._template.safe_substitute(**variables)
-
-    # ── cliente SES ───────────────────────────────────────────────────────────
+    def _render_items(self, items: tuple[tuple[str, str], ...]) -> str:
+        return self._template.safe_substitute(dict(items))
 
-    def _ses_client(self):
-        return boto3.client(
-            "ses",
-            aws_access_key_id=self._access_key,
-            aws_secret_access_key=self._secret_key,
-            region_name=self._region,
-        )
+    def _render(self, **variables: str) -> str:
+        return self._render_cached(tuple(sorted(variables.items())))
 
     # ── montagem da mensagem ──────────────────────────────────────────────────
 
@@ -74,15 +205,12 @@ class EmailSender:
         msg["From"]    = self._from
         msg["To"]      = recipient
 
-        msg_body = MIMEMultipart("alternative")
-        msg_body.attach(MIMEText(body_html.encode("utf-8"), "html", "utf-8"))
-        msg.attach(msg_body)
+        # corpo é só HTML: anexar o MIMEText direto dispensa o invólucro
+        # "alternative", que só acrescentava serialização extra por envio
+        msg.attach(_html_part(body_html))
 
         if attachment and attachment.exists():
-            with open(attachment, "rb") as f:
-                parte = MIMEApplication(f.read())
-            parte.add_header("Content-Disposition", "attachment", filename=attachment.name)
-            msg.attach(parte)
+            msg.attach(_encoded_part(str(attachment), attachment.stat().st_mtime))
 
         return msg
 
@@ -113,13 +241,19 @@ class EmailSender:
 
         body_html = self._render(**template_vars)
         msg = self._build_message(recipient, subject, body_html, attachment)
-        client = self._ses_client()
+
+        # serializa direto para bytes: as_string() materializava a mensagem
+        # inteira como str e o boto3 a recodificava em UTF-8 logo em seguida
+        data = _flatten(msg)
+
+        if self._rate_limiter:
+            self._rate_limiter.acquire()
 
         try:
-            response = client.send_raw_email(
+            response = self._client.send_raw_email(
                 Source=self._from,
                 Destinations=[recipient],
-                RawMessage={"Data": msg.as_string()},
+                RawMessage={"Data": data},
             )
             logging.info(
                 "[EMAIL] enviado → %s%s | MessageId: %s",
@@ -135,3 +269,42 @@ class EmailSender:
             )
             raise
 
+    def send_many(
+        self,
+        jobs: Iterable[EmailJob],
+        max_workers: int | None = None,
+    ) -> list[Exception | None]:
+        """
+        Envia vários e-mails em paralelo com um pool de threads limitado.
+
+        Cada chamada ao SES é dominada pela latência de rede, então a vazão
+        cresce quase linearmente com as threads até a cota da conta; o
+        limitador de taxa compartilhado (SES_RATE_LIMIT) segura rajadas e o
+        retry adaptativo do cliente absorve Throttling residual.
+
+        Retorna, na ordem dos jobs, a exceção de cada envio (None = sucesso).
+        """
+        jobs = list(jobs)
+        resultados: list[Exception | None] = [None] * len(jobs)
+
+        def _worker(idx: int, job: EmailJob) -> None:
+            try:
+                self.send(
+                    recipient=job.recipient,
+                    subject=job.subject,
+                    attachment=job.attachment,
+                    **job.template_vars,
+                )
+            except Exception as e:
+                resultados[idx] = e
+
+        workers = max_workers or settings.EMAIL_WORKERS
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_worker, i, job) for i, job in enumerate(jobs)
+            ]
+            for future in as_completed(futures):
+                future.result()
+
+        return resultados
+
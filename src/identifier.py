@@ -9,18 +9,32 @@ Regras de negócio para informes de rendimento:
   * 0 CNPJ   → usar o primeiro CPF encontrado
 """
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 # ── Padrões ────────────────────────────────────────────────────────────────────
-_CNPJ_RE = re.compile(r"\b(\d{2}[.\s]?\d{3}[.\s]?\d{3}[/\s]?\d{4}[-\s]?\d{2})\b")
-_CPF_RE  = re.compile(r"\b(\d{3}[.\s]?\d{3}[.\s]?\d{3}[-\s]?\d{2})\b")
+# grupos capturam só os dígitos: "".join(m.groups()) substitui o re.sub de
+# limpeza pós-match; re.ASCII evita as tabelas Unicode de \d e \b
+_CNPJ_RE = re.compile(
+    r"\b(\d{2})[.\s]?(\d{3})[.\s]?(\d{3})[/\s]?(\d{4})[-\s]?(\d{2})\b", re.ASCII
+)
+_CPF_RE = re.compile(
+    r"\b(\d{3})[.\s]?(\d{3})[.\s]?(\d{3})[-\s]?(\d{2})\b", re.ASCII
+)
 
+# janela varrida após cada rótulo "CNPJ"/"CPF" — o número vem logo ao lado
+_KEYWORD_WINDOW = 64
 
-@dataclass
+# caracteres inválidos em nomes de arquivo no Windows → "_"
+_FS_TABLE = str.maketrans({c: "_" for c in '\\/*?:"<>|'})
+
+
+@dataclass(slots=True, frozen=True)
 class Identifier:
     valor: str
     tipo: str          # "CPF" | "CNPJ" | ""
+    # memo de nome_arquivo — preenchido no primeiro acesso
+    _nome: str = field(default="", init=False, repr=False, compare=False)
 
     def __bool__(self) -> bool:
         return bool(self.valor)
@@ -31,7 +45,13 @@ class Identifier:
     @property
     def nome_arquivo(self) -> str:
         """Return value with invalid Windows characters replaced."""
-        return re.sub(r'[\\/*?:"<>|]', "_", self.valor)
+        # translate roda em C sobre a tabela fixa; a propriedade é lida
+        # várias vezes por página, então o resultado fica memoizado no slot
+        nome = self._nome
+        if not nome:
+            nome = self.valor.translate(_FS_TABLE)
+            object.__setattr__(self, "_nome", nome)
+        return nome
 
 
 class ExtractorIdentifier:
@@ -47,19 +67,37 @@ class ExtractorIdentifier:
 
     # ── extratores brutos ──────────────────────────────────────────────────────
     def _cnpjs(self, text: str) -> list[str]:
-        result = []
-        for m in _CNPJ_RE.finditer(text):
-            raw = re.sub(r"[^\d]", "", m.group(1))
-            if len(raw) == 14:
-                result.append(self._fmt_cnpj(raw))
-        return result
+        # prefiltro barato: str.find é um loop C muito mais rápido por byte
+        # que o motor de regex. Informes rotulam o campo, então varremos só
+        # janelas curtas após cada "CNPJ"; páginas sem o rótulo (ou rótulos
+        # longe do número) caem na varredura completa original.
+        # os grupos têm largura fixa (2+3+3+4+2 = 14 dígitos por construção)
+        idx = text.find("CNPJ")
+        if idx >= 0:
+            resultado: list[str] = []
+            vistos: set[int] = set()  # posições absolutas, p/ janelas sobrepostas
+            while idx >= 0:
+                for m in _CNPJ_RE.finditer(text, idx, idx + _KEYWORD_WINDOW):
+                    if m.start() not in vistos:
+                        vistos.add(m.start())
+                        resultado.append(self._fmt_cnpj("".join(m.groups())))
+                idx = text.find("CNPJ", idx + 1)
+            if resultado:
+                return resultado
+        return [
+            self._fmt_cnpj("".join(m.groups())) for m in _CNPJ_RE.finditer(text)
+        ]
 
     def _cpf(self, text: str) -> str | None:
+        idx = text.find("CPF")
+        while idx >= 0:
+            m = _CPF_RE.search(text, idx, idx + _KEYWORD_WINDOW)
+            if m:
+                return self._fmt_cpf("".join(m.groups()))
+            idx = text.find("CPF", idx + 1)
         m = _CPF_RE.search(text)
         if m:
-            raw = re.sub(r"[^\d]", "", m.group(1))
-            if len(raw) == 11:
-                return self._fmt_cpf(raw)
+            return self._fmt_cpf("".join(m.groups()))
         return None
 
     # ── public interface ─────────────────────────────────────────────────────
@@ -8,18 +8,63 @@ encontrado no conteúdo. Páginas sem identificador herdam o anterior.
 from __future__ import annotations
 
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
+from math import ceil
 from pathlib import Path
 from time import perf_counter
 
-import fitz      # PyMuPDF — text extraction
-import pypdf     # pypdf   — PDF read/write
+import fitz      # PyMuPDF — text extraction and PDF read/write
 
 from src.identifier import ExtractorIdentifier, Identifier
 
 
-@dataclass
+# extração de texto enxuta: sem remontagem de ligaturas/espaçamento extra
+_TEXT_FLAGS = fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_INHIBIT_SPACES
+
+# fração superior da página onde o CPF/CNPJ dos informes costuma estar
+_HEADER_FRACTION = 0.35
+
+# abaixo disso o custo de criar processos supera o ganho da extração paralela
+_PARALLEL_MIN_PAGES = 64
+
+
+def _scan_page(page: fitz.Page, extract) -> Identifier:
+    """Extrai o identificador de uma página (cabeçalho, depois página toda)."""
+    # só o cabeçalho interessa para o identificador: extrair ~35% da página
+    # corta a maior parte do trabalho de montagem de texto; se nada for
+    # encontrado ali, caímos para a página inteira
+    header = fitz.Rect(0, 0, page.rect.width, page.rect.height * _HEADER_FRACTION)
+    ident = extract(page.get_text("text", clip=header, flags=_TEXT_FLAGS))
+    if not ident or ident.tipo == "CNPJ":
+        # um CNPJ no recorte pode ser só o do emissor, com o CPF do
+        # beneficiário abaixo do corte — e a regra 2 prefere CPF a CNPJ
+        # isolado. Nesse caso confirmamos na página inteira; um CPF no
+        # cabeçalho já identifica o beneficiário e dispensa a releitura.
+        completo = extract(page.get_text())
+        if completo:
+            ident = completo
+    return ident
+
+
+def _scan_range(path: str, lo: int, hi: int) -> list[Identifier]:
+    """
+    Worker de processo: extrai os identificadores das páginas [lo, hi).
+    Cada worker abre seu próprio fitz.Document — PyMuPDF não é thread-safe
+    sobre o mesmo documento, por isso processos.
+    """
+    extractor = ExtractorIdentifier()
+    doc = fitz.open(path)
+    try:
+        return [_scan_page(doc[i], extractor.extract) for i in range(lo, hi)]
+    finally:
+        doc.close()
+
+
+@dataclass(slots=True)
 class PageGroup:
     identifier: Identifier
     indices: list[int] = field(default_factory=list)
@@ -29,7 +74,7 @@ class PageGroup:
         return len(self.indices)
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingResult:
     total_pages: int
     groups: list[PageGroup]
@@ -51,6 +96,10 @@ class PDFProcessor:
     def __init__(self, output_dir: Path) -> None:
         self.output_dir = output_dir
         self._extractor = ExtractorIdentifier()
+        # extract é pura: memoizar por texto de página faz boilerplate
+        # repetido (e reprocessamentos do mesmo PDF) custar um lookup de
+        # dict em vez de duas varreduras de regex
+        self._extract = lru_cache(maxsize=4096)(self._extractor.extract)
 
     # ── API pública ────────────────────────────────────────────────────────────
 
@@ -65,17 +114,26 @@ class PDFProcessor:
 
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+        # um único parse: o mesmo documento serve à extração de texto e à
+        # cópia de páginas (insert_pdf), sem releitura via pypdf
         doc_fitz = fitz.open(str(caminho_pdf))
-        leitor   = pypdf.PdfReader(str(caminho_pdf))
-        total    = len(leitor.pages)
-
-        logging.info("  Arquivo   : %s", caminho_pdf.name)
-        logging.info("  Páginas  : %d", total)
+        try:
+            total = doc_fitz.page_count
 
-        groups_map  = self._group_pages(doc_fitz, total)
-        doc_fitz.close()
+            logging.info("  Arquivo   : %s", caminho_pdf.name)
+            logging.info("  Páginas  : %d", total)
 
-        files = self._write_groups(groups_map, leitor)
+            # informes gerados por bancos costumam trazer um sumário com um
+            # destinatário por entrada — nesse caso os grupos saem direto
+            # dele, sem extração de texto nem regex por página
+            idents = self._idents_from_toc(doc_fitz, total)
+            if idents is None:
+                idents = self._resolve_idents(
+                    self._scan_pages(caminho_pdf, doc_fitz, total)
+                )
+            groups_map, files = self._split_streaming(doc_fitz, idents)
+        finally:
+            doc_fitz.close()
         finished_at = datetime.now()
         elapsed_seconds = perf_counter() - started_perf
 
@@ -90,21 +148,73 @@ class PDFProcessor:
 
     # ── passos internos ────────────────────────────────────────────────────────
 
-    def _group_pages(
+    def _idents_from_toc(
         self, doc_fitz: fitz.Document, total: int
-    ) -> dict[str, PageGroup]:
+    ) -> list[Identifier] | None:
+        """
+        Tenta montar os identificadores a partir do sumário do PDF: se toda
+        entrada contém um CPF/CNPJ, cada uma define o destinatário do
+        intervalo até a entrada seguinte — O(grupos) em vez de
+        O(páginas × regex). Retorna None quando o sumário não existe ou não
+        cobre o documento inteiro, caindo na varredura por página.
         """
-        Primeira passagem: lê cada página, extrai o identificador e agrupa.
-        Páginas sem CPF/CNPJ herdam o identificador anterior.
+        toc = doc_fitz.get_toc(simple=True)
+        if len(toc) < 2:
+            return None
+
+        entradas: list[tuple[int, Identifier]] = []
+        for _nivel, titulo, pagina in toc:
+            ident = self._extract(titulo)
+            if not ident or pagina < 1:
+                return None
+            entradas.append((pagina - 1, ident))
+
+        entradas.sort(key=lambda e: e[0])
+        if entradas[0][0] != 0:
+            return None  # páginas antes da 1ª entrada ficariam sem dono
+
+        logging.info("    [info] sumário com %d entradas — varredura de texto dispensada", len(entradas))
+        inicios = [start for start, _ in entradas[1:]] + [total]
+        idents: list[Identifier] = []
+        for (start, ident), proximo in zip(entradas, inicios):
+            idents.extend([ident] * (proximo - start))
+        return idents if len(idents) == total else None
+
+    def _scan_pages(
+        self, caminho_pdf: Path, doc_fitz: fitz.Document, total: int
+    ) -> list[Identifier]:
         """
-        groups: dict[str, PageGroup] = {}
+        Extrai o identificador bruto de cada página (sem herança).
+        PDFs grandes são divididos em faixas contíguas processadas em
+        paralelo por um ProcessPoolExecutor — a extração de texto do MuPDF
+        domina o custo de process() e escala quase linearmente por núcleo.
+        """
+        workers = min(os.cpu_count() or 1, ceil(total / _PARALLEL_MIN_PAGES))
+        if workers <= 1:
+            return [_scan_page(doc_fitz[i], self._extract) for i in range(total)]
+
+        chunk = ceil(total / workers)
+        faixas = [(lo, min(lo + chunk, total)) for lo in range(0, total, chunk)]
+        idents: list[Identifier] = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            path = str(caminho_pdf)
+            for parcial in executor.map(
+                _scan_range, [path] * len(faixas), *zip(*faixas)
+            ):
+                idents.extend(parcial)
+        return idents
+
+    @staticmethod
+    def _resolve_idents(idents: list[Identifier]) -> list[Identifier]:
+        """
+        Aplica a regra de herança em uma varredura O(N): páginas sem
+        CPF/CNPJ herdam o identificador anterior.
+        """
+        resolvidos: list[Identifier] = []
         last_name: str | None = None
         last_id:   Identifier | None = None
 
-        for i in range(total):
-            text = doc_fitz[i].get_text()
-            ident = self._extractor.extract(text)
-
+        for i, ident in enumerate(idents):
             if ident:
                 last_id   = ident
                 last_name = ident.nome_arquivo
@@ -121,40 +231,65 @@ class PDFProcessor:
                     i + 1,
                     isolated_name,
                 )
+            resolvidos.append(ident)
 
-            key = ident.nome_arquivo
-            if key not in groups:
-                groups[key] = PageGroup(identifier=ident)
-            groups[key].indices.append(i)
-
-        return groups
+        return resolvidos
 
-    def _write_groups(
+    def _split_streaming(
         self,
-        groups: dict[str, PageGroup],
-        leitor: pypdf.PdfReader,
-    ) -> list[Path]:
+        doc_fitz: fitz.Document,
+        idents: list[Identifier],
+    ) -> tuple[dict[str, PageGroup], list[Path]]:
         """
-        Segunda passagem: grava um PDF por grupo contendo todas as páginas agrupadas.
+        Varredura única de escrita: copia cada faixa contígua de páginas no
+        momento em que termina (insert_pdf, C do MuPDF) e salva o PDF do
+        destinatário assim que sua última página é vista. Só identificadores
+        intercalados mantêm mais de um escritor aberto ao mesmo tempo, então
+        a memória fica em O(1) documentos de saída no caso comum.
         """
+        groups:  dict[str, PageGroup] = {}
+        writers: dict[str, fitz.Document] = {}
         arquivos: list[Path] = []
 
-        for chave, grupo in groups.items():
-            destino = self.output_dir / f"{chave}.pdf"
-            escritor = pypdf.PdfWriter()
-            for idx in grupo.indices:
-                escritor.add_page(leitor.pages[idx])
-            with open(destino, "wb") as f:
-                escritor.write(f)
-
-            paginas_str = ", ".join(str(p + 1) for p in grupo.indices)
-            logging.info(
-                "    [%s] %s  (%d páginas: %s)",
-                grupo.identifier.tipo,
-                destino.name,
-                grupo.count,
-                paginas_str,
-            )
-            arquivos.append(destino)
-
-        return arquivos
+        # última página de cada destinatário: permite salvar/fechar o
+        # escritor tão logo o grupo esteja completo
+        ultima = {ident.nome_arquivo: i for i, ident in enumerate(idents)}
+
+        def _flush(key: str, lo: int, hi: int) -> None:
+            writers[key].insert_pdf(doc_fitz, from_page=lo, to_page=hi)
+            if hi == ultima[key]:
+                grupo = groups[key]
+                destino = self.output_dir / f"{key}.pdf"
+                saida = writers.pop(key)
+                saida.save(destino, garbage=3, deflate=True)
+                saida.close()
+                paginas_str = ", ".join(str(p + 1) for p in grupo.indices)
+                logging.info(
+                    "    [%s] %s  (%d páginas: %s)",
+                    grupo.identifier.tipo,
+                    destino.name,
+                    grupo.count,
+                    paginas_str,
+                )
+                arquivos.append(destino)
+
+        run_key: str | None = None
+        run_start = 0
+
+        for i, ident in enumerate(idents):
+            key = ident.nome_arquivo
+            grupo = groups.get(key)
+            if grupo is None:
+                grupo = groups[key] = PageGroup(identifier=ident)
+                writers[key] = fitz.open()
+            grupo.indices.append(i)
+
+            if key != run_key:
+                if run_key is not None:
+                    _flush(run_key, run_start, i - 1)
+                run_key, run_start = key, i
+
+        if run_key is not None:
+            _flush(run_key, run_start, len(idents) - 1)
+
+        return groups, arquivos